@@ -6,25 +6,250 @@ Features robust error handling and UI change resilience.
 """
 import asyncio
 import argparse
+import atexit
 import os
+import re
 from playwright.async_api import async_playwright
-import requests
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import sys
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 import datetime
+import functools
+import hashlib
+import logging
+import logging.handlers
+import queue
+
+
+log = logging.getLogger(__name__)
+
+# Version segment at the end of a documentation URL
+# Matches: /latest, /3.2, /v3.2, /2.21.1, etc.
+VERSION_RE = re.compile(r'/(latest|v?\d+\.\d+(?:\.\d+)?)$')
+
+# Separators accepted between entries of --versions (commas and/or whitespace)
+VERSIONS_SPLIT_RE = re.compile(r'[\s,]+')
+
+# Directory recording which links each notebook already has, one file per notebook
+STATE_DIR = ".nblm_state"
+
+# Maximum number of documentation pages fetched at the same time
+MAX_CONCURRENT_FETCHES = 8
+
+# TOC hrefs with these prefixes never point at documentation pages
+SKIP_HREF_PREFIXES = ('#', 'javascript:', 'mailto:', 'data:', 'tel:')
+
+# File extensions (without the dot) of TOC links that are not documentation content
+SKIP_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'svg', 'webp', 'pdf', 'zip'})
+
+# Selector for the source dialog that NotebookLM opens after clicking Add
+DIALOG_SELECTOR = "[role='dialog']"
+
+# Overlays that can block the notebook UI, tried in order when dismissing them
+OVERLAY_SELECTORS = (
+    # Specific upload dialog backdrop
+    ".cdk-overlay-backdrop.upload-dialog-backdrop",
+    # General overlay backdrops
+    ".cdk-overlay-backdrop",
+    # Material UI overlays
+    ".mdc-dialog__scrim",
+    ".mat-overlay-backdrop",
+    # Generic modal overlays
+    "[data-testid*='overlay']",
+    "[role='dialog']",
+    ".modal-backdrop"
+)
+
+CLOSE_SELECTORS = (
+    "button[aria-label*='close' i]",
+    "button[aria-label*='dismiss' i]",
+    "[data-testid*='close']",
+    ".close-button",
+    "button:has-text('×')",
+    "button:has-text('Close')"
+)
+
+# Candidate selectors for each step of adding sources. The first match in
+# document order wins: each list is joined into one selector list so Playwright
+# checks every candidate in a single query instead of one round-trip each.
+ADD_SELECTORS = (
+    ":text-is('Add')",
+    "button:has-text('Add')",
+    "[data-testid*='add']",
+    "button[aria-label*='Add']",
+    ".add-button",
+    "button:has-text('+ Add')"
+)
+
+# Source type labels in the source dialog. The generic labels are only used when
+# none of the specific ones is shown, since the dialog also has headings like "Link"
+WEBSITE_OPTIONS = ("Website", "Web page", "Webpage")
+WEBSITE_FALLBACK_OPTIONS = ("Web", "URL", "Link")
+YOUTUBE_OPTIONS = ("YouTube", "Youtube", "YouTube video")
+YOUTUBE_FALLBACK_OPTIONS = ("Video",)
+
+# More specific selectors for NotebookLM URL input after selecting "Website"
+INPUT_SELECTORS = (
+    # Most specific - look for URL-related placeholders first
+    "input[placeholder*='Enter URL']",
+    "input[placeholder*='Paste URL']",
+    "input[placeholder*='Add URL']",
+    "input[placeholder*='https://']",
+    "input[placeholder*='http://']",
+    "input[placeholder*='URL']",
+    "input[placeholder*='url']",
+    "input[placeholder*='website']",
+    "input[placeholder*='link']",
+    "input[placeholder*='YouTube']",
+    # Type-specific selectors
+    "input[type='url']",
+    # Dialog-specific selectors (NotebookLM uses Material UI)
+    "[role='dialog'] input[type='text']",
+    ".mdc-dialog input[type='text']",
+    ".mat-dialog-container input[type='text']",
+    # Form-specific within dialog
+    "form input[type='text']",
+    # Material UI input elements within dialog context
+    "[role='dialog'] .mat-mdc-input-element",
+    ".mdc-dialog .mat-mdc-input-element",
+    ".mat-dialog-container .mat-mdc-input-element",
+    # Generic textarea for URL input
+    "[role='dialog'] textarea",
+    ".mdc-dialog textarea",
+    # Last resort - but more specific than before
+    "input[type='text']:not([placeholder*='Search']):not([placeholder*='emoji'])"
+)
+
+# Looked up inside the dialog so the page's own Add button is never matched
+SUBMIT_SELECTORS = (
+    "button:has-text('Insert')",
+    "button:has-text('Add')",
+    "button:has-text('Submit')",
+    "button:has-text('Save')",
+    "button[type='submit']",
+    ".mat-primary",
+    "button.mdc-button--raised"
+)
+
+# Every text field in the source dialog, scored by score_url_input()
+DIALOG_INPUTS = f"{DIALOG_SELECTOR} input, {DIALOG_SELECTOR} textarea"
+
+# Accessible names for the buttons, matched by Playwright's role engine
+ADD_BUTTON_NAME = re.compile(r"^\+?\s*Add", re.I)
+SUBMIT_BUTTON_NAME = re.compile(r"^(Insert|Add|Submit|Save)$", re.I)
+
+ADD_UNION = ", ".join(ADD_SELECTORS)
+INPUT_UNION = ", ".join(INPUT_SELECTORS)
+SUBMIT_UNION = ", ".join(SUBMIT_SELECTORS)
+
+# Look up a list of selectors and read each match's attributes in one evaluate() call
+PROBE_SELECTORS_JS = """
+(selectors) => selectors.map(s => {
+    try {
+        const el = document.querySelector(s);
+        return el
+            ? {ok: true, p: el.placeholder || '', a: el.getAttribute('aria-label') || '', t: el.type || ''}
+            : {ok: false};
+    } catch (e) {
+        return {ok: false, error: e.message};
+    }
+})
+"""
+
+# Set an input's value directly and fire the events Angular listens for.
+# Returns whether the value stuck so the caller can fall back to fill().
+SET_VALUE_JS = """
+(el, value) => {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return el.value === value;
+}
+"""
+
+# Describe each element matching a selector so the URL input can be picked in Python
+DIALOG_INPUTS_JS = """
+(selector) => [...document.querySelectorAll(selector)].map((e, i) => ({
+    i,
+    tag: e.tagName.toLowerCase(),
+    type: (e.getAttribute('type') || 'text').toLowerCase(),
+    p: e.placeholder || '',
+    a: e.getAttribute('aria-label') || '',
+    visible: e.getClientRects().length > 0
+}))
+"""
+
+# Count the inputs on the page and describe the first 10 for debugging
+LIST_INPUTS_JS = """
+() => {
+    const inputs = [...document.querySelectorAll('input')];
+    return [inputs.length, inputs.slice(0, 10).map(e => ({
+        t: e.getAttribute('type') || 'text', p: e.placeholder || '', a: e.getAttribute('aria-label') || ''
+    }))];
+}
+"""
+
+
+async def wait_for_state(locator, state, timeout=10000):
+    """
+    Wait for a locator to reach a state instead of sleeping blindly.
+
+    Args:
+        locator: Playwright Locator to watch (the first match is used)
+        state (str): "attached", "detached", "visible" or "hidden"
+        timeout (int): Maximum wait in milliseconds
+
+    Returns:
+        bool: True if the state was reached, False on timeout
+    """
+    try:
+        await locator.first.wait_for(state=state, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def first_visible(locators, timeout=10000):
+    """
+    Wait for any of several locators to be visible and return the preferred one.
+
+    Waiting on all of them at once means a fallback never costs a timeout,
+    and checking them in order afterwards means an earlier locator wins even
+    when a later one matches something earlier in the page.
+
+    Args:
+        locators (list): Playwright Locators in priority order
+        timeout (int): Maximum wait in milliseconds
+
+    Returns:
+        Locator for the first visible match of the highest-priority locator, or None on timeout
+    """
+    candidates = [locator.filter(visible=True) for locator in locators]
+    any_visible = candidates[0]
+    for candidate in candidates[1:]:
+        any_visible = any_visible.or_(candidate)
+    if not await wait_for_state(any_visible, "visible", timeout=timeout):
+        return None
+    for candidate in candidates:
+        if await candidate.first.is_visible():
+            return candidate.first
+    return None
 
 
 async def take_debug_screenshot(page, step_name):
-    """Take a screenshot for debugging UI issues"""
+    """Take a screenshot for debugging UI issues (only when debug logging is enabled)"""
+    if not log.isEnabledFor(logging.DEBUG):
+        return None
     try:
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_path = f"debug_screenshot_{step_name}_{timestamp}.png"
         await page.screenshot(path=screenshot_path)
-        print(f"📸 Debug screenshot saved: {screenshot_path}")
+        log.debug(f"📸 Debug screenshot saved: {screenshot_path}")
         return screenshot_path
     except Exception as e:
-        print(f"⚠️ Could not take screenshot: {e}")
+        log.warning(f"⚠️ Could not take screenshot: {e}")
         return None
 
 
@@ -42,10 +267,10 @@ async def detect_notebooklm_version(page):
             "timestamp": datetime.datetime.now().isoformat()
         }
         
-        print(f"🔍 NotebookLM page info: {version_info['title']}")
+        log.debug(f"🔍 NotebookLM page info: {version_info['title']}")
         return version_info
     except Exception as e:
-        print(f"⚠️ Could not detect page version: {e}")
+        log.debug(f"⚠️ Could not detect page version: {e}")
         return {"error": str(e)}
 
 
@@ -93,27 +318,28 @@ async def enhanced_element_search(page, element_type="URL input"):
             }
         ]
     
-    print(f"🔍 Enhanced search for {element_type}...")
+    log.debug(f"🔍 Enhanced search for {element_type}...")
+    
+    # Probe every selector and read its attributes in a single round-trip
+    selectors = [selector for strategy in strategies for selector in strategy["selectors"]]
+    try:
+        probes = await page.evaluate(PROBE_SELECTORS_JS, selectors)
+    except Exception as e:
+        log.debug(f"   ❌ Element probe failed: {e}")
+        return None, None, None
+    results = dict(zip(selectors, probes))
     
     for strategy in strategies:
-        print(f"   🎯 Trying strategy: {strategy['name']}")
+        log.debug(f"   🎯 Trying strategy: {strategy['name']}")
         for selector in strategy["selectors"]:
-            try:
-                element = page.locator(selector).first
-                if await element.count() > 0:
-                    # Additional validation
-                    placeholder = await element.get_attribute("placeholder") or ""
-                    aria_label = await element.get_attribute("aria-label") or ""
-                    element_type_attr = await element.get_attribute("type") or ""
-                    
-                    print(f"      ✅ Found element with selector: {selector}")
-                    print(f"         Type: {element_type_attr}, Placeholder: '{placeholder}', Aria-label: '{aria_label}'")
-                    
-                    return element, selector, strategy["name"]
-                    
-            except Exception as e:
-                print(f"      ❌ Selector failed: {selector} - {e}")
-                continue
+            info = results[selector]
+            if "error" in info:
+                log.debug(f"      ❌ Selector failed: {selector} - {info['error']}")
+            elif info["ok"]:
+                log.debug(f"      ✅ Found element with selector: {selector}")
+                log.debug(f"         Type: {info['t']}, Placeholder: '{info['p']}', Aria-label: '{info['a']}'")
+                
+                return page.locator(selector).first, selector, strategy["name"]
     
     return None, None, None
 
@@ -125,8 +351,6 @@ async def login(profile_path):
     Args:
         profile_path (str): Path to the browser profile directory
     """
-    profile_path = os.path.expanduser(profile_path)
-
     async with async_playwright() as p:
         browser = await p.chromium.launch_persistent_context(
             user_data_dir=profile_path,
@@ -135,11 +359,253 @@ async def login(profile_path):
         page = await browser.new_page()
         await page.goto("https://accounts.google.com")
 
-        print("Please log in manually and then close the browser window when done.")
+        log.info("Please log in manually and then close the browser window when done.")
         try:
             await page.wait_for_timeout(60000 * 10)  # 10 minutes to log in
         except Exception as e:
-            print(f"Finished with {e}")
+            log.info(f"Finished with {e}")
+
+
+# Requests the automation never needs: it only drives the source dialog's controls
+# Images, fonts, media and analytics, matched by URL since Chromium's blocklist has no resource types
+BLOCKED_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "webp", "ico",
+    "woff", "woff2", "ttf", "otf",
+    "mp4", "webm", "mp3",
+)
+BLOCKED_URL_PATTERNS = [
+    pattern
+    for ext in BLOCKED_EXTENSIONS
+    for pattern in (f"*.{ext}", f"*.{ext}?*")
+] + ["*analytics*", "*googletagmanager*"]
+
+
+async def block_unneeded_resources(page):
+    """
+    Stop a page from loading images, fonts, media and analytics.
+
+    Uses Chromium's own URL blocklist over CDP rather than context.route(),
+    which would disable the HTTP cache and pass every request through Python.
+    """
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+
+class BrowserPool:
+    """
+    Keep one persistent browser context warm and hand out reusable pages.
+
+    Chromium is launched on the first acquire() and reused until close(), so
+    repeated link additions only pay for navigation, not browser start-up.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._context = None
+        self._profile_path = None
+        self._pages = None
+        self._size = 0
+        self._lock = None
+
+    async def _ensure(self, profile_path, size=1):
+        """Launch the browser for profile_path if needed and grow the pool to size pages"""
+        if self._context is not None and self._profile_path != profile_path:
+            await self.close()
+
+        if self._context is None:
+            self._playwright = await async_playwright().start()
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=profile_path,
+                headless=False,
+            )
+            self._profile_path = profile_path
+            self._pages = asyncio.Queue()
+            # Reuse the blank tab Chromium opens with the persistent profile
+            for page in self._context.pages[:size]:
+                await block_unneeded_resources(page)
+                self._pages.put_nowait(page)
+                self._size += 1
+
+        while self._size < size:
+            self._pages.put_nowait(await self._new_page())
+            self._size += 1
+
+    async def _new_page(self):
+        """Open a page in the browser context with unneeded resources blocked"""
+        page = await self._context.new_page()
+        await block_unneeded_resources(page)
+        return page
+
+    async def acquire(self, profile_path, size=1):
+        """
+        Lease a page, waiting for one to be released if all are in use.
+
+        Args:
+            profile_path (str): Path to the browser profile directory
+            size (int): Number of pages the pool should keep open
+
+        Returns:
+            Page: A Playwright page to return with release()
+
+        Raises:
+            RuntimeError: If the browser was closed while waiting for a page
+        """
+        # Created lazily so the lock belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._ensure(profile_path, size)
+        page = await self._pages.get()
+        if page is None:
+            # Pass the sentinel on so every other waiting acquire() fails too
+            self._pages.put_nowait(None)
+            raise RuntimeError("Browser was closed")
+        return page
+
+    async def release(self, page):
+        """Return a leased page to the pool, opening a replacement if it was closed"""
+        if self._pages is None:
+            return
+        if not page.is_closed():
+            self._pages.put_nowait(page)
+            return
+        try:
+            self._pages.put_nowait(await self._new_page())
+        except PlaywrightError:
+            # The browser window itself was closed, so no page will come back;
+            # wake waiting acquire() calls with a sentinel instead of leaving them blocked
+            self._size -= 1
+            self._pages.put_nowait(None)
+
+    async def close(self):
+        """Close the browser and stop Playwright"""
+        if self._context is not None:
+            await self._context.close()
+            await self._playwright.stop()
+        self._playwright = None
+        self._context = None
+        self._profile_path = None
+        self._pages = None
+        self._size = 0
+        self._lock = None
+
+
+POOL = BrowserPool()
+
+
+async def find_add_button(page, timeout=10000):
+    """Find the notebook's Add source button by ARIA role, falling back to ADD_SELECTORS"""
+    return await first_visible(
+        [page.get_by_role("button", name=ADD_BUTTON_NAME), page.locator(ADD_UNION)],
+        timeout=timeout,
+    )
+
+
+def source_option_locators(dialog, options):
+    """Role and text locators for any of the given source type labels within dialog"""
+    names = re.compile(r"(^|\s)(" + "|".join(re.escape(option) for option in options) + r")$")
+    texts = ", ".join(f":text-is('{option}')" for option in options)
+    return [dialog.get_by_role("button", name=names), dialog.locator(texts)]
+
+
+async def find_source_option(page, options, fallback_options, timeout=10000):
+    """
+    Find a source type option (e.g. Website) in the source dialog.
+
+    Args:
+        page: Playwright page with the source dialog open
+        options (tuple): Preferred option labels, e.g. WEBSITE_OPTIONS
+        fallback_options (tuple): Generic labels used only if no preferred one is visible
+        timeout (int): Maximum wait in milliseconds
+
+    Returns:
+        Locator for the option, or None if none appeared
+    """
+    dialog = page.locator(DIALOG_SELECTOR)
+    return await first_visible(
+        source_option_locators(dialog, options) + source_option_locators(dialog, fallback_options),
+        timeout=timeout,
+    )
+
+
+async def find_submit_button(page, timeout=10000):
+    """Find the source dialog's submit button by ARIA role, falling back to SUBMIT_SELECTORS"""
+    dialog = page.locator(DIALOG_SELECTOR)
+    return await first_visible(
+        [dialog.get_by_role("button", name=SUBMIT_BUTTON_NAME), dialog.locator(SUBMIT_UNION)],
+        timeout=timeout,
+    )
+
+
+def score_url_input(info):
+    """
+    Score how likely a dialog field is to be the URL input.
+
+    Args:
+        info (dict): Field description from DIALOG_INPUTS_JS
+
+    Returns:
+        int: Higher is better; negative means the field must not be used
+    """
+    text = f"{info['p']} {info['a']}".lower()
+    if not info["visible"] or "emoji" in text or "search" in text:
+        return -1
+    if info["tag"] == "input" and info["type"] not in ("text", "url"):
+        return -1
+    
+    score = 0
+    if any(term in text for term in ("url", "http", "website", "link", "youtube")):
+        score += 10
+    if info["type"] == "url":
+        score += 5
+    if info["tag"] == "textarea":
+        score += 2  # The multi-URL field is a textarea
+    return score
+
+
+async def find_url_input(page):
+    """
+    Find the URL input in the source dialog.
+
+    All dialog fields are described in one evaluate() call and the best
+    scoring one is used. Falls back to the INPUT_SELECTORS list if the
+    dialog has no usable field.
+
+    Args:
+        page: Playwright page with the source dialog open
+
+    Returns:
+        Locator for the URL input, or None if none was found
+    """
+    log.debug("🔍 Searching for URL input field...")
+    candidates = page.locator(DIALOG_INPUTS)
+    # Dialogs can hold hidden fields (e.g. a file upload input), so wait for a visible one
+    if await wait_for_state(candidates.filter(visible=True).first, "visible"):
+        fields = await page.evaluate(DIALOG_INPUTS_JS, DIALOG_INPUTS)
+        best = max(fields, key=score_url_input, default=None)
+        if best is not None and score_url_input(best) >= 0:
+            log.debug(f"   ✅ Found URL input (dialog field {best['i']+1} of {len(fields)})")
+            log.debug(f"      Placeholder: '{best['p']}'")
+            log.debug(f"      Aria-label: '{best['a']}'")
+            return candidates.nth(best["i"])
+    
+    # Fallback: the dialog markup changed, so try the broader selector list
+    url_input = page.locator(INPUT_UNION).first
+    if not await wait_for_state(url_input, "visible", timeout=2000):
+        return None
+    
+    # Additional validation - check if it's not a search/emoji field
+    attrs = await url_input.evaluate(
+        "e => ({p: e.placeholder || '', a: e.getAttribute('aria-label') || ''})"
+    )
+    if any(term in (attrs["p"] + attrs["a"]).lower() for term in ["emoji", "search"]):
+        log.debug(f"   ⏭️  Skipping emoji/search field")
+        return None
+    log.debug(f"   ✅ Found URL input")
+    log.debug(f"      Placeholder: '{attrs['p']}'")
+    log.debug(f"      Aria-label: '{attrs['a']}'")
+    return url_input
 
 
 def create_bulk_urls_text(links, output_file="bulk_urls.txt"):
@@ -151,21 +617,19 @@ def create_bulk_urls_text(links, output_file="bulk_urls.txt"):
         output_file (str): Output file path
     
     Returns:
-        str: The combined URLs text
+        list: The HTTP URLs written to the file
     """
     # Filter out non-URL entries (keep only actual HTTP URLs)
     url_links = [link for link in links if link.startswith('http')]
     
-    urls_text = '\n'.join(url_links)
-    
-    # Save to file for manual fallback
+    # Save to file for manual fallback, streaming lines rather than joining them first
     with open(output_file, 'w') as f:
-        f.write(urls_text)
+        f.writelines(f"{link}\n" for link in url_links)
     
-    print(f"📄 Created bulk URLs file: {output_file}")
-    print(f"🔗 Contains {len(url_links)} URLs for bulk addition")
+    log.info(f"📄 Created bulk URLs file: {output_file}")
+    log.info(f"🔗 Contains {len(url_links)} URLs for bulk addition")
     
-    return urls_text, url_links
+    return url_links
 
 
 async def add_links_bulk(notebook_url, links, profile_path):
@@ -176,504 +640,398 @@ async def add_links_bulk(notebook_url, links, profile_path):
         notebook_url (str): URL of the NotebookLM notebook
         links (list): List of links to add as sources
         profile_path (str): Path to the browser profile directory
+
+    Returns:
+        list: The URLs that were submitted (empty if the submission failed)
     """
-    profile_path = os.path.expanduser(profile_path)
-    
-    # Create bulk URLs text
-    urls_text, url_links = create_bulk_urls_text(links)
+    # Create bulk URLs file
+    url_links = create_bulk_urls_text(links)
     
     if not url_links:
-        print("❌ No valid URLs found to add")
-        return
+        log.error("❌ No valid URLs found to add")
+        return []
     
-    print(f"🚀 Adding {len(url_links)} URLs in bulk...")
-    print(f"💡 Manual fallback: If automation fails, copy URLs from 'bulk_urls.txt'")
+    log.info(f"🚀 Adding {len(url_links)} URLs in bulk...")
+    log.info(f"💡 Manual fallback: If automation fails, copy URLs from 'bulk_urls.txt'")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch_persistent_context(
-            user_data_dir=profile_path,
-            headless=False,
-        )
-        page = await browser.new_page()
-        await page.goto(notebook_url)
+    page = await POOL.acquire(profile_path)
+    try:
+        # Only wait for the navigation to commit; the page's "load" event blocks on
+        # fonts and analytics, while the Add button is what we actually need
+        await page.goto(notebook_url, wait_until="commit", timeout=15000)
         
-        print(f"📖 Navigated to notebook")
-        await page.wait_for_timeout(3000)  # Wait for page to load
+        log.info(f"📖 Navigated to notebook")
+        await find_add_button(page, timeout=30000)
 
         try:
             # Step 1: Enhanced overlay dismissal - try multiple strategies
-            print("🔄 Dismissing any blocking overlays...")
+            log.debug("🔄 Dismissing any blocking overlays...")
             
-            # Strategy 1: Wait a bit longer for any overlays to fully appear
-            await page.wait_for_timeout(5000)
+            # Strategy 1: Give an auto-opened overlay a brief chance to attach; the Add button
+            # is already visible, so most loads have none and this shouldn't hold them up
+            await wait_for_state(page.locator(".cdk-overlay-backdrop"), "attached", timeout=1000)
             
             # Strategy 2: Try multiple overlay dismissal approaches
-            overlay_strategies = [
-                # Specific upload dialog backdrop
-                ".cdk-overlay-backdrop.upload-dialog-backdrop",
-                # General overlay backdrops
-                ".cdk-overlay-backdrop",
-                # Material UI overlays
-                ".mdc-dialog__scrim",
-                ".mat-overlay-backdrop",
-                # Generic modal overlays
-                "[data-testid*='overlay']",
-                "[role='dialog']",
-                ".modal-backdrop"
-            ]
-            
-            for i, overlay_selector in enumerate(overlay_strategies):
+            for i, overlay_selector in enumerate(OVERLAY_SELECTORS):
                 try:
                     overlay = page.locator(overlay_selector)
                     overlay_count = await overlay.count()
                     
                     if overlay_count > 0:
-                        print(f"Found {overlay_count} overlay(s) with selector: {overlay_selector}")
+                        log.debug(f"Found {overlay_count} overlay(s) with selector: {overlay_selector}")
                         
                         # Try clicking the overlay to dismiss it
                         await overlay.first.click()
-                        await page.wait_for_timeout(1500)
-                        print(f"Clicked overlay {i+1}")
+                        await wait_for_state(overlay, "hidden", timeout=1500)
+                        log.debug(f"Clicked overlay {i+1}")
                         
                         # Check if it's gone
                         remaining = await overlay.count()
                         if remaining > 0:
-                            print(f" {remaining} overlay(s) still present")
+                            log.debug(f" {remaining} overlay(s) still present")
                         else:
-                            print(f"Overlay dismissed successfully")
+                            log.debug(f"Overlay dismissed successfully")
                             
                 except Exception as e:
-                    print(f"Overlay strategy {i+1} failed: {e}")
+                    log.debug(f"Overlay strategy {i+1} failed: {e}")
                     continue
             
             # Strategy 3: Try Escape key to dismiss any remaining dialogs
             try:
                 await page.keyboard.press("Escape")
-                await page.wait_for_timeout(1000)
+                await wait_for_state(page.locator(DIALOG_SELECTOR), "hidden", timeout=1000)
                 await page.keyboard.press("Escape")  # Double tap just in case
-                await page.wait_for_timeout(1000)
-                print("   ⌨️  Sent Escape keys to dismiss dialogs")
+                await wait_for_state(page.locator(DIALOG_SELECTOR), "hidden", timeout=1000)
+                log.debug("   ⌨️  Sent Escape keys to dismiss dialogs")
             except:
                 pass
             
             # Strategy 4: Check for specific close buttons
-            close_selectors = [
-                "button[aria-label*='close' i]",
-                "button[aria-label*='dismiss' i]", 
-                "[data-testid*='close']",
-                ".close-button",
-                "button:has-text('×')",
-                "button:has-text('Close')"
-            ]
-            
-            for close_selector in close_selectors:
+            for close_selector in CLOSE_SELECTORS:
                 try:
                     close_button = page.locator(close_selector)
                     if await close_button.count() > 0:
                         await close_button.first.click()
-                        await page.wait_for_timeout(1000)
-                        print(f"   🔘 Clicked close button: {close_selector}")
+                        await wait_for_state(close_button, "hidden", timeout=1000)
+                        log.debug(f"   🔘 Clicked close button: {close_selector}")
                         break
                 except:
                     continue
             
             # Step 2: Find and click the Add button
-            add_selectors = [
-                "text='Add'",
-                "button:has-text('Add')",
-                "[data-testid*='add']",
-                "button[aria-label*='Add']",
-                ".add-button",
-                "button:has-text('+ Add')"
-            ]
-            
-            add_button = None
-            for selector in add_selectors:
-                try:
-                    add_button = page.locator(selector).first
-                    if await add_button.count() > 0:
-                        break
-                except:
-                    continue
-            
-            if not add_button or await add_button.count() == 0:
-                print(f"❌ Could not find Add button")
-                print(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
-                await browser.close()
-                return
+            add_button = await find_add_button(page)
+            if not add_button:
+                log.error(f"❌ Could not find Add button")
+                await take_debug_screenshot(page, "add_button")
+                log.info(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
+                return []
             
-            await add_button.wait_for(state="visible", timeout=10000)
             await add_button.click()
-            print("✅ Clicked Add button")
-            
-            # Step 3: Click on Website option
-            await page.wait_for_timeout(2000)  # Wait for dialog to appear
-            
-            website_selectors = ["Website", "Web page", "Webpage", "Web", "URL", "Link"]
-            source_button = None
-            for option in website_selectors:
-                try:
-                    button = page.locator(f"text='{option}'").first
-                    if await button.count() > 0:
-                        source_button = button
-                        break
-                except:
-                    continue
+            log.info("✅ Clicked Add button")
             
+            # Step 3: Click on Website option (waits for the dialog to appear)
+            source_button = await find_source_option(page, WEBSITE_OPTIONS, WEBSITE_FALLBACK_OPTIONS)
             if not source_button:
-                print(f"❌ Could not find Website option")
-                print(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
-                await browser.close()
-                return
+                log.error(f"❌ Could not find Website option")
+                await take_debug_screenshot(page, "website_option")
+                log.info(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
+                return []
             
             await source_button.click()
-            print("✅ Selected Website option")
+            log.info("✅ Selected Website option")
             
             # Step 4: Find and fill the URL input with ALL URLs at once
-            await page.wait_for_timeout(2000)
-            
-            # More specific selectors for NotebookLM URL input after selecting "Website"
-            input_selectors = [
-                # Most specific - look for URL-related placeholders first
-                "input[placeholder*='Enter URL']",
-                "input[placeholder*='Paste URL']", 
-                "input[placeholder*='Add URL']",
-                "input[placeholder*='https://']",
-                "input[placeholder*='http://']",
-                "input[placeholder*='URL']",
-                "input[placeholder*='url']",
-                "input[placeholder*='website']",
-                "input[placeholder*='link']",
-                # Type-specific selectors
-                "input[type='url']",
-                # Dialog-specific selectors (NotebookLM uses Material UI)
-                "[role='dialog'] input[type='text']",
-                ".mdc-dialog input[type='text']",
-                ".mat-dialog-container input[type='text']",
-                # Form-specific within dialog
-                "form input[type='text']",
-                # Material UI input elements within dialog context
-                "[role='dialog'] .mat-mdc-input-element",
-                ".mdc-dialog .mat-mdc-input-element", 
-                ".mat-dialog-container .mat-mdc-input-element",
-                # Generic textarea for URL input
-                "[role='dialog'] textarea",
-                ".mdc-dialog textarea",
-                # Last resort - but more specific than before
-                "input[type='text']:not([placeholder*='Search']):not([placeholder*='emoji'])"
-            ]
-            
-            url_input = None
-            print("🔍 Searching for URL input field...")
-            
-            for i, selector in enumerate(input_selectors):
-                try:
-                    input_elem = page.locator(selector).first
-                    if await input_elem.count() > 0:
-                        # Additional validation - check if it's not a search/emoji field
-                        placeholder = await input_elem.get_attribute("placeholder") or ""
-                        aria_label = await input_elem.get_attribute("aria-label") or ""
-                        
-                        # Skip emoji/search fields
-                        if any(term in (placeholder + aria_label).lower() for term in ["emoji", "search"]):
-                            print(f"   ⏭️  Skipping selector {i+1}: {selector} (emoji/search field)")
-                            continue
-                            
-                        url_input = input_elem
-                        print(f"   ✅ Found URL input with selector {i+1}: {selector}")
-                        print(f"      Placeholder: '{placeholder}'")
-                        print(f"      Aria-label: '{aria_label}'")
-                        break
-                except Exception as e:
-                    print(f"   ❌ Selector {i+1} failed: {selector} - {e}")
-                    continue
+            url_input = await find_url_input(page)
             
             if not url_input:
-                print(f"❌ Could not find URL input field")
-                print(f"🔍 Let me check what input fields are available...")
+                log.error(f"❌ Could not find URL input field")
+                await take_debug_screenshot(page, "url_input")
+                log.debug(f"🔍 Let me check what input fields are available...")
                 
                 # Debug: List all input elements to help identify the correct one
                 try:
-                    all_inputs = page.locator("input")
-                    input_count = await all_inputs.count()
-                    print(f"📊 Found {input_count} input elements on page:")
+                    input_count, inputs = await page.evaluate(LIST_INPUTS_JS)
+                    log.debug(f"📊 Found {input_count} input elements on page:")
                     
-                    for i in range(min(input_count, 10)):  # Limit to first 10
-                        input_elem = all_inputs.nth(i)
-                        input_type = await input_elem.get_attribute("type") or "text"
-                        placeholder = await input_elem.get_attribute("placeholder") or ""
-                        aria_label = await input_elem.get_attribute("aria-label") or ""
-                        print(f"   {i+1}. type='{input_type}' placeholder='{placeholder}' aria-label='{aria_label}'")
+                    for i, info in enumerate(inputs):
+                        log.debug(f"   {i+1}. type='{info['t']}' placeholder='{info['p']}' aria-label='{info['a']}'")
                         
                 except Exception as debug_e:
-                    print(f"   Debug failed: {debug_e}")
+                    log.debug(f"   Debug failed: {debug_e}")
                 
-                print(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
-                await browser.close()
-                return
+                log.info(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
+                return []
             
-            # Clear and fill with ALL URLs
+            # Replace the input's value with ALL URLs in one DOM update
             await url_input.click()
-            await url_input.fill("")  # Clear first
-            await url_input.fill(urls_text)  # Add all URLs at once
-            print(f"✅ Pasted {len(url_links)} URLs into input field")
+            urls_text = "\n".join(url_links)
+            try:
+                value_set = await url_input.evaluate(SET_VALUE_JS, urls_text)
+            except Exception:
+                value_set = False
+            if not value_set:
+                # Fall back to Playwright's input simulation
+                await url_input.fill(urls_text)
+            log.info(f"✅ Pasted {len(url_links)} URLs into input field")
             
-            # Step 5: Find and click submit button
-            await page.wait_for_timeout(1000)
+            # Step 5: Find and click submit button (click() waits for it to become enabled)
+            submit_button = await find_submit_button(page)
+            if not submit_button:
+                log.error(f"❌ Could not find submit button")
+                await take_debug_screenshot(page, "submit_button")
+                log.info(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
+                return []
             
-            submit_selectors = [
-                "button:has-text('Insert')",
-                "button:has-text('Add')",
-                "button:has-text('Submit')", 
-                "button:has-text('Save')",
-                "button[type='submit']",
-                ".mat-primary",
-                "button.mdc-button--raised"
-            ]
+            await submit_button.click()
+            log.info(f"✅ Submitted bulk URLs")
             
-            submit_button = None
-            for selector in submit_selectors:
-                try:
-                    btn = page.locator(selector).first
-                    if await btn.count() > 0:
-                        submit_button = btn
-                        break
-                except:
-                    continue
+            # Wait for the dialog to close once NotebookLM accepts the URLs
+            if not await wait_for_state(page.locator(DIALOG_SELECTOR), "hidden", timeout=30000):
+                log.warning("⚠️  Source dialog still open - check NotebookLM for processing errors")
+                return []
+            log.info(f"🎉 Successfully submitted {len(url_links)} URLs for processing")
+            return url_links
+            
+        except Exception as e:
+            log.error(f"❌ Error during bulk addition: {str(e)}")
+            await take_debug_screenshot(page, "bulk_error")
+            log.info(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
+            return []
+    finally:
+        await POOL.release(page)
+
+
+async def _add_one(link, notebook_url, profile_path, max_concurrency, position):
+    """
+    Add a single link as a source using a page leased from the browser pool.
+
+    Args:
+        link (str): Link to add as a source
+        notebook_url (str): URL of the NotebookLM notebook
+        profile_path (str): Path to the browser profile directory
+        max_concurrency (int): Pool size, which bounds how many pages work at once
+        position (str): Progress label such as "3/10" for log output
+
+    Returns:
+        bool: True if the link was added, False otherwise
+    """
+    page = await POOL.acquire(profile_path, size=max_concurrency)
+    try:
+        log.info(f"🔗 Processing {position}: {link[:60]}...")
+        try:
+            # Pages are reused between links, so only navigate on first use
+            if page.url != notebook_url:
+                # Wait for the Add button rather than the page's full "load" event
+                await page.goto(notebook_url, wait_until="commit", timeout=15000)
+                await find_add_button(page, timeout=30000)
+
+            # Step 1: Dismiss any overlay dialogs
+            try:
+                overlay_backdrop = page.locator(".cdk-overlay-backdrop")
+                if await overlay_backdrop.count() > 0:
+                    await overlay_backdrop.click()
+                    await wait_for_state(overlay_backdrop, "hidden", timeout=1000)
+            except:
+                pass
+            
+            # Step 2: Find and click the Add button
+            add_button = await find_add_button(page)
+            if not add_button:
+                log.error(f"   ❌ [{position}] Could not find Add button")
+                return False
             
+            await add_button.click()
+            
+            # Step 3: Find and click the appropriate source type (waits for the dialog to appear)
+            if "youtube.com" in link:
+                source_button = await find_source_option(page, YOUTUBE_OPTIONS, YOUTUBE_FALLBACK_OPTIONS)
+            else:
+                source_button = await find_source_option(page, WEBSITE_OPTIONS, WEBSITE_FALLBACK_OPTIONS)
+            
+            if not source_button:
+                log.error(f"   ❌ [{position}] Could not find source type option")
+                return False
+            
+            await source_button.click()
+            
+            # Step 4: Find and fill the URL input
+            url_input = await find_url_input(page)
+            
+            if not url_input:
+                log.error(f"   ❌ [{position}] Could not find URL input field")
+                return False
+            
+            # Clear and fill the input
+            await url_input.click()
+            await url_input.fill("")  # Clear first
+            await url_input.fill(link)
+            
+            # Step 5: Find and click submit button
+            submit_button = await find_submit_button(page)
             if not submit_button:
-                print(f"❌ Could not find submit button")
-                print(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
-                await browser.close()
-                return
+                log.error(f"   ❌ [{position}] Could not find submit button")
+                return False
             
             await submit_button.click()
-            print(f"✅ Submitted bulk URLs")
             
-            # Wait for processing
-            await page.wait_for_timeout(5000)
-            print(f"🎉 Successfully submitted {len(url_links)} URLs for processing")
+            # Wait for the dialog to close before the page is reused for the next link;
+            # if it stays open NotebookLM didn't accept the link, so don't record it
+            if not await wait_for_state(page.locator(DIALOG_SELECTOR), "hidden", timeout=15000):
+                log.error(f"   ❌ [{position}] Source dialog still open after submitting")
+                return False
+
+            # Record it straight away so an interrupted run doesn't re-add it next time
+            save_added_links(notebook_url, [link])
+            log.info(f"   ✅ [{position}] Successfully added")
+            return True
             
         except Exception as e:
-            print(f"❌ Error during bulk addition: {str(e)}")
-            print(f"📄 Manual fallback: Copy URLs from 'bulk_urls.txt' and paste into NotebookLM")
-        
-        await browser.close()
+            log.error(f"   ❌ [{position}] Error: {str(e)}")
+            return False
+    finally:
+        # Leave the page clean for the next link in case a dialog is still open
+        try:
+            await page.keyboard.press("Escape")
+        except:
+            pass
+        await POOL.release(page)
 
 
 # Keep the old function as fallback
-async def add_links_individual(notebook_url, links, profile_path):
+async def add_links_individual(notebook_url, links, profile_path, max_concurrency=5):
     """
     Add links as sources to a NotebookLM notebook individually (legacy method).
+
+    Links are processed concurrently on pages leased from the shared browser
+    pool, so every page reuses the saved login session and stays on the
+    notebook between links.
     
     Args:
         notebook_url (str): URL of the NotebookLM notebook
         links (list): List of links to add as sources
         profile_path (str): Path to the browser profile directory
+        max_concurrency (int): Maximum number of pages adding links at once (default: 5)
+
+    Returns:
+        list: The links that were added successfully
     """
-    profile_path = os.path.expanduser(profile_path)
+    # Never open more tabs than there are links to add
+    tabs = min(max_concurrency, len(links))
+    log.info(f"📖 Adding {len(links)} links using up to {tabs} tabs")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch_persistent_context(
-            user_data_dir=profile_path,
-            headless=False,
-        )
-        page = await browser.new_page()
-        await page.goto(notebook_url)
-        
-        print(f"📖 Navigated to notebook")
-        await page.wait_for_timeout(3000)  # Wait for page to load
+    results = await asyncio.gather(
+        *(_add_one(link, notebook_url, profile_path, tabs, f"{i+1}/{len(links)}")
+          for i, link in enumerate(links)),
+        return_exceptions=True
+    )
 
-        successful_links = []
-        failed_links = []
+    successful_links = [link for link, ok in zip(links, results) if ok is True]
+    failed_links = [link for link, ok in zip(links, results) if ok is not True]
+    
+    # Summary
+    log.info(f"\n📊 Summary:")
+    log.info(f"✅ Successfully added: {len(successful_links)}")
+    log.info(f"❌ Failed to add: {len(failed_links)}")
+    
+    if failed_links:
+        log.info(f"\n❌ Failed links:")
+        for link in failed_links:
+            log.info(f"   - {link}")
 
-        for i, link in enumerate(links):
-            print(f"🔗 Processing {i+1}/{len(links)}: {link[:60]}...")
-            
-            try:
-                # Step 1: Dismiss any overlay dialogs
-                try:
-                    overlay_backdrop = page.locator(".cdk-overlay-backdrop")
-                    if await overlay_backdrop.count() > 0:
-                        await overlay_backdrop.click()
-                        await page.wait_for_timeout(1000)
-                except:
-                    pass
-                
-                # Step 2: Find and click the Add button with multiple fallbacks
-                add_selectors = [
-                    "text='Add'",
-                    "button:has-text('Add')",
-                    "[data-testid*='add']",
-                    "button[aria-label*='Add']",
-                    ".add-button",
-                    "button:has-text('+ Add')"
-                ]
-                
-                add_button = None
-                for selector in add_selectors:
-                    try:
-                        add_button = page.locator(selector).first
-                        if await add_button.count() > 0:
-                            break
-                    except:
-                        continue
-                
-                if not add_button or await add_button.count() == 0:
-                    print(f"   ❌ Could not find Add button")
-                    failed_links.append(link)
-                    continue
-                
-                await add_button.wait_for(state="visible", timeout=10000)
-                await add_button.click()
-                
-                # Step 3: Find and click the appropriate source type
-                await page.wait_for_timeout(2000)  # Wait for dialog to appear
-                
-                # Determine source type options to look for
-                if "youtube.com" in link:
-                    target_options = ["YouTube", "Youtube", "YouTube video", "Video"]
-                else:
-                    target_options = ["Website", "Web page", "Webpage", "Web", "URL", "Link"]
-                
-                source_button = None
-                for option in target_options:
-                    try:
-                        button = page.locator(f"text='{option}'").first
-                        if await button.count() > 0:
-                            source_button = button
-                            break
-                    except:
-                        continue
-                
-                if not source_button:
-                    print(f"   ❌ Could not find source type option")
-                    failed_links.append(link)
-                    # Try to close dialog
-                    try:
-                        await page.keyboard.press("Escape")
-                        await page.wait_for_timeout(1000)
-                    except:
-                        pass
-                    continue
-                
-                await source_button.click()
-                
-                # Step 4: Find and fill the URL input with multiple fallbacks
-                await page.wait_for_timeout(2000)
-                
-                input_selectors = [
-                    "input[placeholder*='URL']",
-                    "input[placeholder*='url']",
-                    "input[placeholder*='link']",
-                    "input[placeholder*='YouTube']",
-                    "input[type='url']",
-                    "input[type='text']",
-                    ".mat-mdc-input-element",
-                    "textarea"
-                ]
-                
-                url_input = None
-                for selector in input_selectors:
-                    try:
-                        input_elem = page.locator(selector).first
-                        if await input_elem.count() > 0:
-                            url_input = input_elem
-                            break
-                    except:
-                        continue
-                
-                if not url_input:
-                    print(f"   ❌ Could not find URL input field")
-                    failed_links.append(link)
-                    continue
-                
-                # Clear and fill the input
-                await url_input.click()
-                await url_input.fill("")  # Clear first
-                await url_input.fill(link)
-                
-                # Step 5: Find and click submit button with multiple fallbacks
-                await page.wait_for_timeout(1000)
-                
-                submit_selectors = [
-                    "button:has-text('Insert')",
-                    "button:has-text('Add')",
-                    "button:has-text('Submit')",
-                    "button:has-text('Save')",
-                    "button[type='submit']",
-                    ".mat-primary",
-                    "button.mdc-button--raised"
-                ]
-                
-                submit_button = None
-                for selector in submit_selectors:
-                    try:
-                        btn = page.locator(selector).first
-                        if await btn.count() > 0:
-                            submit_button = btn
-                            break
-                    except:
-                        continue
-                
-                if not submit_button:
-                    print(f"   ❌ Could not find submit button")
-                    failed_links.append(link)
-                    continue
-                
-                await submit_button.click()
-                print(f"   ✅ Successfully added")
-                successful_links.append(link)
-                
-                # Wait for processing
-                await page.wait_for_timeout(3000)
-                
-            except Exception as e:
-                print(f"   ❌ Error: {str(e)}")
-                failed_links.append(link)
-                
-                # Try to escape any dialogs and continue
-                try:
-                    await page.keyboard.press("Escape")
-                    await page.wait_for_timeout(1000)
-                except:
-                    pass
-                continue
+    return successful_links
+
+
+def added_links_path(notebook_url):
+    """Path of the file recording which links were added to a notebook"""
+    notebook_id = hashlib.sha1(notebook_url.encode()).hexdigest()
+    return os.path.join(STATE_DIR, f"{notebook_id}.seen")
 
-        await browser.close()
-        
-        # Summary
-        print(f"\n📊 Summary:")
-        print(f"✅ Successfully added: {len(successful_links)}")
-        print(f"❌ Failed to add: {len(failed_links)}")
-        
-        if failed_links:
-            print(f"\n❌ Failed links:")
-            for link in failed_links:
-                print(f"   - {link}")
+
+def load_added_links(notebook_url):
+    """
+    Load the links recorded as added to a notebook by earlier runs.
+
+    Args:
+        notebook_url (str): URL of the NotebookLM notebook
+
+    Returns:
+        set: Previously added links (empty if none were recorded)
+    """
+    try:
+        return set(read_links_from_file(added_links_path(notebook_url)))
+    except FileNotFoundError:
+        return set()
+
+
+def save_added_links(notebook_url, links):
+    """
+    Record links as added to a notebook.
+
+    The file is rewritten through a temporary file and os.replace() so an
+    interrupted run never leaves it half-written.
+
+    Args:
+        notebook_url (str): URL of the NotebookLM notebook
+        links (list): Links that were just added
+    """
+    path = added_links_path(notebook_url)
+    os.makedirs(STATE_DIR, exist_ok=True)
+    all_links = load_added_links(notebook_url).union(links)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.writelines(f"{link}\n" for link in sorted(all_links))
+    os.replace(tmp_path, path)
 
 
 # Use bulk addition by default, with fallback option
-async def add_links(notebook_url, links, profile_path, use_bulk=True):
+async def add_links(notebook_url, links, profile_path, use_bulk=True, max_concurrency=5, force=False):
     """
     Add links as sources to a NotebookLM notebook.
+
+    Links recorded as added to this notebook by an earlier run are skipped,
+    and the browser is not opened at all if nothing new is left.
     
     Args:
         notebook_url (str): URL of the NotebookLM notebook
         links (list): List of links to add as sources
         profile_path (str): Path to the browser profile directory
         use_bulk (bool): Whether to use bulk addition (default: True)
+        max_concurrency (int): Tabs used in parallel for individual addition (default: 5)
+        force (bool): Add every link even if it was added before (default: False)
     """
-    if use_bulk:
-        await add_links_bulk(notebook_url, links, profile_path)
-    else:
-        await add_links_individual(notebook_url, links, profile_path)
+    # Only URLs are ever added or recorded, so drop notes and other non-URL lines
+    # before comparing, otherwise they'd look new on every run
+    links = [link for link in links if link.startswith('http')]
+    if not links:
+        log.error("❌ No valid URLs found to add")
+        return
+
+    seen = set() if force else load_added_links(notebook_url)
+    new_links = [link for link in links if link not in seen]
+    if len(new_links) < len(links):
+        log.info(f"⏭️  Skipping {len(links) - len(new_links)} links already added to this notebook (use --force to re-add)")
+    if not new_links:
+        log.info("✅ All links have already been added to this notebook")
+        return
+    
+    try:
+        if use_bulk:
+            added = await add_links_bulk(notebook_url, new_links, profile_path)
+            if added:
+                save_added_links(notebook_url, added)
+        else:
+            # Each link is recorded as soon as its dialog closes
+            await add_links_individual(notebook_url, new_links, profile_path, max_concurrency)
+    finally:
+        await POOL.close()
 
 
 def read_links_from_file(file_path):
     """Read links from a file, one link per line."""
-    with open(file_path, "r") as f:
-        return [line.strip() for line in f if line.strip()]
+    # One read and one decode, then a C-level splitlines(); utf-8-sig drops a leading BOM
+    with open(file_path, "rb") as f:
+        text = f.read().decode("utf-8-sig", "replace")
+    return [line for line in map(str.strip, text.splitlines()) if line]
 
 
 def combine_links_from_files(main_file, static_file="CQA_res.txt", skip_static=False):
@@ -693,9 +1051,13 @@ def combine_links_from_files(main_file, static_file="CQA_res.txt", skip_static=F
     try:
         main_links = read_links_from_file(main_file)
         all_links.extend(main_links)
-        print(f"📄 Loaded {len(main_links)} links from {main_file}")
+        log.info(f"📄 Loaded {len(main_links)} links from {main_file}")
     except FileNotFoundError:
-        print(f"❌ Main links file not found: {main_file}")
+        log.error(f"❌ Error: Main links file not found - {main_file}")
+        log.info("Available options:")
+        log.info("  1. Run --extract-toc first to create a links file")
+        log.info("  2. Specify --links-file with an existing file")
+        log.info("  3. Provide --links with individual URLs")
         return []
     
     # Only try to read static file if not skipping
@@ -703,24 +1065,20 @@ def combine_links_from_files(main_file, static_file="CQA_res.txt", skip_static=F
         try:
             static_links = read_links_from_file(static_file)
             all_links.extend(static_links)
-            print(f"📄 Loaded {len(static_links)} static links from {static_file}")
+            log.info(f"📄 Loaded {len(static_links)} static links from {static_file}")
         except FileNotFoundError:
-            print(f"⚠️  Static links file not found: {static_file} (skipping)")
+            log.warning(f"⚠️  Static links file not found: {static_file} (skipping)")
     else:
-        print(f"⏭️  Skipping static file {static_file} (--skip-cqa flag used)")
+        log.info(f"⏭️  Skipping static file {static_file} (--skip-cqa flag used)")
     
     # Remove duplicates while preserving order
-    unique_links = []
-    seen = set()
-    for link in all_links:
-        if link not in seen:
-            unique_links.append(link)
-            seen.add(link)
-    
-    print(f"🔗 Total unique links to process: {len(unique_links)}")
+    unique_links = list(dict.fromkeys(all_links))
+    
+    log.info(f"🔗 Total unique links to process: {len(unique_links)}")
     return unique_links
 
 
+@functools.lru_cache(maxsize=1024)
 def detect_version_in_url(url):
     """
     Detect if a URL contains a version pattern and extract it.
@@ -731,16 +1089,10 @@ def detect_version_in_url(url):
     Returns:
         tuple: (base_url_without_version, detected_version) or (original_url, None)
     """
-    import re
-    
     # Remove trailing slash for consistent processing
     url = url.rstrip('/')
     
-    # Pattern to match version at the end of URL
-    # Matches: /latest, /3.2, /v3.2, /2.21.1, etc.
-    version_pattern = r'/(latest|v?\d+\.\d+(?:\.\d+)?)$'
-    
-    match = re.search(version_pattern, url)
+    match = VERSION_RE.search(url)
     if match:
         version = match.group(1)
         base_url = url[:match.start()]
@@ -749,9 +1101,187 @@ def detect_version_in_url(url):
     return url, None
 
 
-def extract_toc_links(base_url, versions=None, output_file="urls.txt"):
+def create_http_session():
+    """
+    Create the HTTP session used for documentation fetches.
+
+    The session keeps a pool of keep-alive connections per host, retries
+    failed connections and transient error statuses with backoff and asks
+    for compressed responses.
+    Versions are fetched in parallel, so each fetch that starts while the
+    others are in flight opens its own connection and TLS handshake; only
+    fetches that start after one finishes (more versions than
+    MAX_CONCURRENT_FETCHES) reuse a pooled connection.
+
+    Returns:
+        requests.Session: Configured session
+    """
+    # Imported here so --login and --notebook runs don't pay for the HTTP stack
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry, make_headers
+
+    session = requests.Session()
+    # pool_connections is the number of hosts kept (scrapes hit one docs host);
+    # pool_maxsize must cover MAX_CONCURRENT_FETCHES or connections get discarded
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=max(20, MAX_CONCURRENT_FETCHES),
+        # Rate limiting and 5xx from the docs host are usually transient, so retry
+        # those too rather than losing the whole version
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+        ),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
+        'Accept-Language': 'en-US,en;q=0.9',
+        # Only lists the encodings urllib3 can decode here: br (much smaller than gzip
+        # for HTML) comes from the brotli package in requirements.txt
+        'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+    })
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_session():
+    """
+    Return the shared HTTP session, creating it on first use.
+
+    Documentation fetches share it so they reuse pooled keep-alive connections.
+    Call from the event loop thread, not from worker threads.
+    """
+    return create_http_session()
+
+
+@functools.lru_cache(maxsize=8192)
+def normalize_link(version_url, href):
+    """
+    Resolve an href against its page URL and point it at the single-page HTML.
+
+    TOC pages repeat the same hrefs many times, so results are cached.
+
+    Args:
+        version_url (str): URL the page was fetched from
+        href (str): Raw href attribute value
+
+    Returns:
+        str: Absolute URL, or None if the href can't be parsed as a URL
+    """
+    try:
+        absolute_url = urljoin(version_url, href)
+    except ValueError:
+        # e.g. "http://[broken" - one bad href shouldn't lose the whole page
+        return None
+
+    # Transform /html/ to /html-single/ in the URL
+    if '/html/' in absolute_url:
+        absolute_url = absolute_url.replace('/html/', '/html-single/')
+
+    return absolute_url
+
+
+class HrefCollector:
+    """
+    lxml parser target that records the href of every <a> tag.
+
+    Using a target means lxml never builds an element tree for the page.
+    """
+
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, attrib):
+        if tag == 'a':
+            href = attrib.get('href')
+            if href:
+                self.hrefs.append(href)
+
+    def close(self):
+        return self.hrefs
+
+
+def fetch_content_links(session, version_url, base_url):
+    """
+    Stream one TOC page and collect its content links.
+
+    Blocking; run it in a worker thread.
+
+    Args:
+        session (requests.Session): Session to fetch with
+        version_url (str): URL of the version's TOC page
+        base_url (str): Documentation URL without version; links must start with it
+
+    Returns:
+        set: Absolute content links found on the page
+    """
+    from lxml import etree
+
+    # lxml's C parser decodes the bytes itself (honouring <meta charset>)
+    parser = etree.HTMLParser(target=HrefCollector())
+    with session.get(version_url, timeout=15, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            parser.feed(chunk)
+    hrefs = parser.close()
+
+    # Normalize and dedup first, so the remaining checks run once per unique URL
+    links = {
+        normalize_link(version_url, href)
+        for href in hrefs
+        if not href.startswith(SKIP_HREF_PREFIXES)
+    }
+    links.discard(None)
+    # Take the extension from the path only, so "?v=2" or "#x.png" can't hide or fake one
+    base_prefix = base_url.rstrip('/') + '/'
+    return {
+        url for url in links
+        if url.startswith(base_prefix)
+        and urlsplit(url).path.rpartition('.')[2].lower() not in SKIP_EXTENSIONS
+    }
+
+
+async def fetch_version_links(base_url, version):
+    """
+    Fetch one version's documentation page and collect its content links.
+
+    Args:
+        base_url (str): Documentation URL without version or trailing slash
+        version (str): Version to fetch
+
+    Returns:
+        set: Links found for this version (empty if the fetch failed)
+    """
+    import requests
+    from lxml import etree
+
+    version_url = f"{base_url.rstrip('/')}/{version}"
+    log.info(f"Extracting content links from: {version_url}")
+    
+    try:
+        # requests and lxml are blocking, so download and parse in a worker
+        # thread; several pages stream in while the loop keeps scheduling
+        session = get_http_session()
+        version_links = await asyncio.to_thread(fetch_content_links, session, version_url, base_url)
+        
+        log.info(f"✅ Extracted {len(version_links)} links for version {version}")
+        return version_links
+        
+    except (requests.RequestException, etree.LxmlError, ValueError) as e:
+        # Retries are done by the session; anything left is a real failure for this version
+        log.error(f"❌ Failed to extract from {version_url}: {str(e)}")
+        return set()
+
+
+async def extract_toc_links_async(base_url, versions=None, output_file="urls.txt", max_concurrency=MAX_CONCURRENT_FETCHES):
     """
-    Extract documentation links from a base URL with smart version detection
+    Extract documentation links from a base URL with smart version detection.
+    All versions are fetched concurrently.
     
     Args:
         base_url (str): Documentation URL (with or without version)
@@ -759,92 +1289,80 @@ def extract_toc_links(base_url, versions=None, output_file="urls.txt"):
                        If version detected in URL and versions specified, uses specified versions
         versions (list): List of versions to process (default: detected version or "latest")
         output_file (str): Output file path
+        max_concurrency (int): Maximum number of version pages fetched at once
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9'
-    }
-    
     # Check if URL already contains a version
     clean_base_url, detected_version = detect_version_in_url(base_url)
     
     if detected_version:
-        print(f"🔍 Detected version '{detected_version}' in URL")
+        log.info(f"🔍 Detected version '{detected_version}' in URL")
         if versions is None or len(versions) == 0:
             # Use the detected version
             versions = [detected_version]
-            print(f"Using detected version: {detected_version}")
+            log.info(f"Using detected version: {detected_version}")
         else:
             # User specified versions, use those instead
-            print(f"Ignoring detected version '{detected_version}', using specified versions: {', '.join(versions)}")
+            log.info(f"Ignoring detected version '{detected_version}', using specified versions: {', '.join(versions)}")
         base_url = clean_base_url
     else:
         # No version detected in URL
         if versions is None or len(versions) == 0:
             versions = ["latest"]
-            print("No versions specified, defaulting to 'latest'")
+            log.info("No versions specified, defaulting to 'latest'")
         else:
-            print(f"Processing specified versions: {', '.join(versions)}")
+            log.info(f"Processing specified versions: {', '.join(versions)}")
     
     # Clean up base URL (remove trailing slash)
     base_url = base_url.rstrip('/')
     
-    all_links = set()
+    # Fetch versions concurrently, with a bounded number in flight at once so a
+    # long version list doesn't hit the docs server all at the same moment
+    sem = asyncio.Semaphore(max_concurrency)
     
-    # Process each version
-    for version in versions:
-        version_url = f"{base_url.rstrip('/')}/{version}"
-        print(f"Extracting content links from: {version_url}")
-        
-        try:
-            response = requests.get(version_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            version_links = set()
-            
-            # Extract all hrefs from the page
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
-                # Skip invalid links
-                if not href or href.startswith(('#', 'javascript:', 'mailto:')):
-                    continue
-                    
-                # Convert to absolute URL
-                absolute_url = urljoin(version_url, href)
-
-                # Transform /html/ to /html-single/ in the URL
-                if '/html/' in absolute_url:
-                    absolute_url = absolute_url.replace('/html/', '/html-single/')
-                
-                # Filter for URLs containing the specific base path
-                if base_url in absolute_url:
-                    # Filter out non-content URLs
-                    if not any(absolute_url.lower().endswith(ext) for ext in ('.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip')):
-                        version_links.add(absolute_url)
-            
-            print(f"✅ Extracted {len(version_links)} links for version {version}")
-            all_links.update(version_links)
-            
-        except Exception as e:
-            print(f"❌ Failed to extract from {version_url}: {str(e)}")
+    async def fetch_bounded(version):
+        async with sem:
+            return await fetch_version_links(base_url, version)
+    
+    results = await asyncio.gather(*(fetch_bounded(version) for version in versions))
+    
+    # Versions mostly share URLs, so merge every result in a single union
+    all_links = set().union(*results)
     
     # Write all links to file
     if all_links:
+        sorted_links = sorted(all_links)
+        # Stream lines rather than building one joined string of every link
         with open(output_file, 'w') as f:
-            f.write("\n".join(sorted(all_links)))
+            f.writelines(f"{link}\n" for link in sorted_links)
         
-        print(f"\n✅ Success! Extracted {len(all_links)} total links to {output_file}")
-        print("Sample links:")
-        for sample in sorted(all_links)[:5]:
-            print(f" - {sample}")
+        log.info(f"\n✅ Success! Extracted {len(all_links)} total links to {output_file}")
+        log.info("Sample links:")
+        for sample in sorted_links[:5]:
+            log.info(f" - {sample}")
         return True
     else:
-        print("❌ No valid links extracted")
+        log.error("❌ No valid links extracted")
         return False
 
 
+def extract_toc_links(base_url, versions=None, output_file="urls.txt", max_concurrency=MAX_CONCURRENT_FETCHES):
+    """
+    Synchronous wrapper around extract_toc_links_async for callers outside an event loop.
+
+    Returns:
+        bool: True if any links were extracted and written
+    """
+    return asyncio.run(extract_toc_links_async(base_url, versions, output_file, max_concurrency))
+
+
+def positive_int(value):
+    """argparse type for options that need a whole number of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="NotebookLM Automation Tool - Enhanced Version\n"
@@ -858,6 +1376,8 @@ def main():
                         help="Authenticate with Google account")
     parser.add_argument("--profile-path", default="~/.browser_automation",
                         help="Browser profile directory (default: ~/.browser_automation)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show detailed browser automation steps and save debug screenshots on failure")
     
     # Extraction mode arguments
     parser.add_argument("--extract-toc", metavar="URL",
@@ -867,7 +1387,7 @@ def main():
                         help="Output file for extracted links (default: urls.txt)\n"
                              "Always uses urls.txt unless explicitly changed for consistency")
     parser.add_argument("--versions", 
-                        help="Comma-separated list of versions to process\n"
+                        help="Comma- or space-separated list of versions to process\n"
                              "Example: --versions 2.21,2.22,2.23\n"
                              "Default: 'latest' if not specified")
     
@@ -880,41 +1400,60 @@ def main():
                                 "Will also include CQA_res.txt if available")
     link_group.add_argument("--individual", action="store_true",
                            help="Use individual URL addition instead of bulk (slower, legacy method)")
+    link_group.add_argument("--force", action="store_true",
+                           help="Re-add links even if an earlier run already added them to this notebook")
+    link_group.add_argument("--max-concurrency", type=positive_int, default=5,
+                           help="Number of browser tabs adding links in parallel with --individual (default: 5)")
     link_group.add_argument("--skip-cqa", action="store_true",
                        help="Skip including CQA_res.txt when using file-based links")
 
     args = parser.parse_args()
+    # Resolve once so every step (and the browser pool) sees the same absolute path
+    args.profile_path = os.path.abspath(os.path.expanduser(args.profile_path))
+
+    # Log to stdout alongside the workflow's own messages; --verbose only affects this script's logger
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
+    # Hand records to a listener thread so writing to stdout never blocks the event loop
+    # while fetches are in flight; the listener flushes what's left on exit
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
 
     # Track operations to perform
     operations_performed = 0
     
     # Step 1: Extraction mode (if specified)
     if args.extract_toc:
-        print("🔍 Step 1: Extracting documentation links...")
+        log.info("🔍 Step 1: Extracting documentation links...")
         # Process versions if specified
-        versions = [v.strip() for v in args.versions.split(',') if v.strip()] if args.versions else None
+        versions = [v for v in VERSIONS_SPLIT_RE.split(args.versions) if v] if args.versions else None
         
-        success = extract_toc_links(
+        success = asyncio.run(extract_toc_links_async(
             base_url=args.extract_toc,
             versions=versions,
             output_file=args.toc_output
-        )
+        ))
         if not success:
-            print("❌ Extraction failed, stopping workflow")
+            log.error("❌ Extraction failed, stopping workflow")
             sys.exit(1)
         operations_performed += 1
-        print("✅ Extraction completed successfully\n")
+        log.info("✅ Extraction completed successfully\n")
 
     # Step 2: Login mode (if specified)
     if args.login:
-        print("🔐 Step 2: Starting authentication process...")
+        log.info("🔐 Step 2: Starting authentication process...")
         asyncio.run(login(args.profile_path))
-        print("✅ Login completed successfully\n")
+        log.info("✅ Login completed successfully\n")
         operations_performed += 1
 
     # Step 3: Link addition mode (if specified)
     if args.notebook:
-        print("📚 Step 3: Adding links to notebook...")
+        log.info("📚 Step 3: Adding links to notebook...")
         if args.links:
             # Direct links provided via command line
             links = args.links
@@ -923,48 +1462,41 @@ def main():
             # Always use urls.txt for consistency unless user specifies otherwise
             main_file = args.links_file  # This will be urls.txt by default
             
-            # Check if main file exists
-            if not os.path.exists(main_file):
-                print(f"❌ Error: Main links file not found - {main_file}")
-                print("Available options:")
-                print("  1. Run --extract-toc first to create a links file")
-                print("  2. Specify --links-file with an existing file")
-                print("  3. Provide --links with individual URLs")
-                sys.exit(1)
-            
-            # Combine links from main file + CQA_res.txt (unless skipped)
+            # Combine links from main file + CQA_res.txt (unless skipped);
+            # a missing main file is reported there and leaves links empty
             links = combine_links_from_files(main_file, skip_static=args.skip_cqa)
         
         if not links:
-            print("❌ No links found to process")
+            log.error("❌ No links found to process")
             sys.exit(1)
             
-        print(f"🚀 Adding {len(links)} sources to notebook...")
-        asyncio.run(add_links(args.notebook, links, args.profile_path, not args.individual))
+        log.info(f"🚀 Adding {len(links)} sources to notebook...")
+        asyncio.run(add_links(args.notebook, links, args.profile_path, not args.individual,
+                              args.max_concurrency, args.force))
         operations_performed += 1
-        print("✅ Notebook update completed successfully")
+        log.info("✅ Notebook update completed successfully")
 
     # No valid operations selected
     if operations_performed == 0:
-        print("❌ No valid operation specified. You can combine multiple operations:")
-        print("  --extract-toc URL  : Extract documentation links to urls.txt")
-        print("  --login            : Authenticate with Google")
-        print("  --notebook URL     : Add links from urls.txt + CQA_res.txt to notebook (bulk mode)")
-        print("  --skip-cqa         : Don't include CQA_res.txt when using file-based links")
-        print("\nExamples:")
-        print("  # Full workflow (extract → login → add in bulk):")
-        print("  python3 script.py --extract-toc URL --login --notebook NOTEBOOK_URL")
-        print("  # Extract then add (uses urls.txt automatically, bulk mode):")
-        print("  python3 script.py --extract-toc URL --notebook NOTEBOOK_URL")
-        print("  # Login then add (uses existing urls.txt, bulk mode):")
-        print("  python3 script.py --login --notebook NOTEBOOK_URL")
-        print("  # Use only custom file (skip CQA_res.txt):")
-        print("  python3 script.py --notebook NOTEBOOK_URL --links-file custom.txt --skip-cqa")
-        print("  # Use individual addition (slower, legacy):")
-        print("  python3 script.py --notebook NOTEBOOK_URL --individual")
+        log.error("❌ No valid operation specified. You can combine multiple operations:")
+        log.info("  --extract-toc URL  : Extract documentation links to urls.txt")
+        log.info("  --login            : Authenticate with Google")
+        log.info("  --notebook URL     : Add links from urls.txt + CQA_res.txt to notebook (bulk mode)")
+        log.info("  --skip-cqa         : Don't include CQA_res.txt when using file-based links")
+        log.info("\nExamples:")
+        log.info("  # Full workflow (extract → login → add in bulk):")
+        log.info("  python3 script.py --extract-toc URL --login --notebook NOTEBOOK_URL")
+        log.info("  # Extract then add (uses urls.txt automatically, bulk mode):")
+        log.info("  python3 script.py --extract-toc URL --notebook NOTEBOOK_URL")
+        log.info("  # Login then add (uses existing urls.txt, bulk mode):")
+        log.info("  python3 script.py --login --notebook NOTEBOOK_URL")
+        log.info("  # Use only custom file (skip CQA_res.txt):")
+        log.info("  python3 script.py --notebook NOTEBOOK_URL --links-file custom.txt --skip-cqa")
+        log.info("  # Use individual addition (slower, legacy):")
+        log.info("  python3 script.py --notebook NOTEBOOK_URL --individual")
         sys.exit(1)
     
-    print(f"\n🎉 Workflow completed! Performed {operations_performed} operation(s).")
+    log.info(f"\n🎉 Workflow completed! Performed {operations_performed} operation(s).")
     sys.exit(0)
 
 